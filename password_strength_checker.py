@@ -13,15 +13,25 @@ Usage:
 Optional flags:
   --show   Use visible input instead of hidden getpass
   --json   Output machine-readable JSON
+  --color  Color the strength label (human-readable output only)
 
 This file is self-contained. No third-party packages required.
 """
 from __future__ import annotations
 import re
 import sys
+import bisect
+import hashlib
 import json
 import math
-from typing import Dict, List, Tuple
+import os
+import pathlib
+import getpass
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple
 
 COMMON_PASSWORDS = {
     # Short, illustrative set. In README, note this can be expanded.
@@ -43,46 +53,187 @@ SEQUENTIAL_ASC = "abcdefghijklmnopqrstuvwxyz"
 SEQUENTIAL_DESC = SEQUENTIAL_ASC[::-1]
 DIGITS = "0123456789"
 
-SYMBOLS_RE = re.compile(r"[^A-Za-z0-9]")
-LOWER_RE = re.compile(r"[a-z]")
-UPPER_RE = re.compile(r"[A-Z]")
-DIGIT_RE = re.compile(r"[0-9]")
+# Scores below each threshold get the label at the same index
+LABEL_THRESHOLDS = (25, 50, 75)
+LABELS = ("Weak", "Fair", "Good", "Strong")
+
+# ANSI-colored labels for --color, built once rather than per print
+RESET = "\033[0m"
+LABEL_COLORS = {"Weak": "\033[31m", "Fair": "\033[33m", "Good": "\033[36m", "Strong": "\033[32m"}
+COLORED_LABELS = {label: f"{code}{label}{RESET}" for label, code in LABEL_COLORS.items()}
+
 REPEAT_RE = re.compile(r"(.)\1{2,}")  # runs of >=3 of the same char
-DATE_RE = re.compile(r"(?:(?:19|20)\d{2}|\d{2}[/-]\d{2}[/-](?:19|20)\d{2})")
+# A year like 1999/2024. Full dd/mm/yyyy dates always contain one, so a
+# single branch finds them without a second alternative to try.
+DATE_RE = re.compile(r"(?:19|20)\d{2}")
+
+class _Trie:
+    """Radix tree of words: each edge holds a whole run of characters.
+
+    Chains of single-child nodes are collapsed into one edge label, and
+    leaves allocate no edge dict, so a node costs little more than a
+    set entry.
+    """
+    __slots__ = ("edges", "is_word")
+
+    def __init__(self) -> None:
+        self.edges: Dict[str, Tuple[str, _Trie]] | None = None  # first char -> (label, child)
+        self.is_word = False
+
+    def add(self, word: str) -> None:
+        node = self
+        while word:
+            if node.edges is None:
+                node.edges = {}
+            edge = node.edges.get(word[0])
+            if edge is None:
+                leaf = _Trie()
+                leaf.is_word = True
+                node.edges[word[0]] = (word, leaf)
+                return
+            label, child = edge
+            k = 1
+            while k < len(label) and k < len(word) and label[k] == word[k]:
+                k += 1
+            if k < len(label):
+                # Split the edge where the new word diverges from it
+                mid = _Trie()
+                mid.edges = {label[k]: (label[k:], child)}
+                node.edges[word[0]] = (label[:k], mid)
+                child = mid
+            node = child
+            word = word[k:]
+        node.is_word = True
+
+def _build_trie(words: Iterable[str]) -> _Trie:
+    root = _Trie()
+    for w in words:
+        root.add(w)
+    return root
+
+DICT_TRIE = _build_trie(w for w in DICTIONARY_WORDS if len(w) >= 4)
+
+class BloomFilter:
+    """Compact set for large wordlists: no false negatives, ~error_rate false positives.
+
+    Uses about 10 bits per entry at 1%, versus ~100 bytes per entry for a set of str.
+    """
+    __slots__ = ("size", "hashes", "bits")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_bits(cls, size: int, hashes: int, bits: bytes) -> BloomFilter:
+        bloom = cls.__new__(cls)
+        bloom.size = size
+        bloom.hashes = hashes
+        bloom.bits = bytearray(bits)
+        return bloom
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k bit positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+# Optional large blacklist, e.g. a breach wordlist; see build_common_passwords().
+# The Bloom filter answers most lookups in memory; its hits are confirmed
+# against the exact on-disk copy so a false positive is never reported.
+# Swapped as one tuple so readers never see a filter paired with the wrong db.
+_EXTRA_COMMON: Tuple[BloomFilter, sqlite3.Connection] | None = None
+_EXTRA_COMMON_LOCK = threading.Lock()  # one sqlite3 connection, shared by threads
+
+# Basic leetspeak reversal; trie edges are matched against both spellings
+_LEET_TABLE = str.maketrans({"0": "o", "1": "l", "3": "e", "5": "s", "7": "t", "@": "a", "$": "s"})
+
+# c * log2(c) for small counts, so entropy needs no per-character log call
+_XLOG2X = [0.0] + [i * math.log2(i) for i in range(1, 257)]
+
+def _entropy_from_counts(counts: Dict[str, int], length: int) -> float:
+    # -sum(p*log2(p)) rewritten as log2(L) - sum(c*log2(c))/L
+    table = _XLOG2X
+    log2 = math.log2
+    limit = len(table)
+    if length < limit:
+        # No count can exceed the table, so sum lookups without a Python-level loop
+        total = sum(map(table.__getitem__, counts.values()))
+    else:
+        total = sum(table[c] if c < limit else c * log2(c) for c in counts.values())
+    # The rewrite leaves float residue the direct sum does not (1.0 comes out
+    # as 0.9999999999999996), which int(entropy * 2) and round(entropy, 2)
+    # would then see. Snap it away, and clamp so one repeated character
+    # reports 0.0, not -0.0.
+    return max(0.0, round(log2(length) - total / length, 12))
 
 def shannon_entropy(s: str) -> float:
+    """Shannon entropy of s in bits per character.
+
+    Equal character counts give exact powers of two:
+
+    >>> shannon_entropy("A" * 14 + "b" * 14)
+    1.0
+    >>> shannon_entropy("AAAAAAAbbbbbbb3333333!!!!!!!")
+    2.0
+    >>> shannon_entropy("aaaa")
+    0.0
+    """
     if not s:
         return 0.0
-    from collections import Counter
+    return _entropy_from_counts(Counter(s), len(s))
+
+def char_classes(s: Iterable[str]) -> Dict[str, bool]:
+    # One pass with early exit; ASCII ranges match the old [a-z]/[A-Z]/[0-9] classes
+    lower = upper = digit = symbol = False
+    for c in s:
+        if "a" <= c <= "z":
+            lower = True
+        elif "A" <= c <= "Z":
+            upper = True
+        elif "0" <= c <= "9":
+            digit = True
+        else:
+            symbol = True
+        if lower and upper and digit and symbol:
+            break
+    return {"lower": lower, "upper": upper, "digit": digit, "symbol": symbol}
+
+def char_stats(s: str) -> Tuple[Dict[str, bool], float]:
+    """Character classes and Shannon entropy from one histogram of s."""
+    if not s:
+        return char_classes(s), 0.0
     counts = Counter(s)
-    length = len(s)
-    return -sum((c/length) * math.log2(c/length) for c in counts.values())
-
-def char_classes(s: str) -> Dict[str, bool]:
-    return {
-        "lower": bool(LOWER_RE.search(s)),
-        "upper": bool(UPPER_RE.search(s)),
-        "digit": bool(DIGIT_RE.search(s)),
-        "symbol": bool(SYMBOLS_RE.search(s)),
-    }
+    # Iterating the histogram visits each distinct character once
+    return char_classes(counts), _entropy_from_counts(counts, len(s))
+
+def _sequence_windows(min_len: int) -> FrozenSet[str]:
+    """All ascending/descending alphabetical and digit runs of length min_len."""
+    return frozenset(
+        src[i:i+min_len]
+        for src in (SEQUENTIAL_ASC, SEQUENTIAL_DESC, DIGITS)
+        for i in range(len(src) - min_len + 1)
+    )
+
+FORBIDDEN_SEQS = _sequence_windows(4)
 
 def has_sequence(s: str, min_len: int = 4) -> bool:
     s_low = s.lower()
-    # Check alphabetical ascending/descending
-    for i in range(len(SEQUENTIAL_ASC) - min_len + 1):
-        seq = SEQUENTIAL_ASC[i:i+min_len]
-        if seq in s_low:
-            return True
-    for i in range(len(SEQUENTIAL_DESC) - min_len + 1):
-        seq = SEQUENTIAL_DESC[i:i+min_len]
-        if seq in s_low:
-            return True
-    # Check digit sequences
-    for i in range(len(DIGITS) - min_len + 1):
-        seq = DIGITS[i:i+min_len]
-        if seq in s_low:
-            return True
-    return False
+    # Look up each of the password's own windows instead of scanning for every run
+    seqs = FORBIDDEN_SEQS if min_len == 4 else _sequence_windows(min_len)
+    return any(s_low[i:i+min_len] in seqs for i in range(len(s_low) - min_len + 1))
 
 def has_keyboard_sequence(s: str) -> bool:
     s_low = s.lower()
@@ -90,28 +241,205 @@ def has_keyboard_sequence(s: str) -> bool:
 
 
 def looks_like_date(s: str) -> bool:
-    return bool(DATE_RE.search(s))
+    # Most passwords hold no year prefix at all; str.__contains__ rejects them
+    # faster than starting the regex engine
+    if "19" not in s and "20" not in s:
+        return False
+    return DATE_RE.search(s) is not None
 
 
 def contains_dictionary_word(s: str) -> bool:
     s_low = s.lower()
-    # Check direct words and leet-like simple variants
-    variants: List[str] = [s_low]
-    # Basic leetspeak reversal
-    table = str.maketrans({"0": "o", "1": "l", "3": "e", "5": "s", "7": "t", "@": "a", "$": "s"})
-    variants.append(s_low.translate(table))
-
-    for word in DICTIONARY_WORDS:
-        for v in variants:
-            if word in v and len(word) >= 4:
-                return True
+    s_leet = s_low.translate(_LEET_TABLE)
+    n = len(s_low)
+
+    # Walk DICT_TRIE from each index, matching edge labels against the
+    # literal and leetspeak spellings; skip starts no word begins with
+    first = DICT_TRIE.edges or {}
+    stack = [(DICT_TRIE, i) for i in range(n) if s_low[i] in first or s_leet[i] in first]
+    while stack:
+        node, j = stack.pop()
+        if node.is_word:
+            return True
+        edges = node.edges
+        if edges is None or j == n:
+            continue
+        a = s_low[j]
+        b = s_leet[j]
+        for ch in (a, b) if a != b else (a,):
+            edge = edges.get(ch)
+            if edge is not None:
+                label, child = edge
+                if s_low.startswith(label, j) or _leet_match(label, s_low, s_leet, j):
+                    stack.append((child, j + len(label)))
     return False
 
 
-def evaluate_password(pw: str) -> Dict:
+def _leet_match(label: str, s_low: str, s_leet: str, j: int) -> bool:
+    # Each label character may match either the literal or the leet character
+    if s_leet.startswith(label, j):
+        return True
+    end = j + len(label)
+    return not label.isalpha() and end <= len(s_low) and all(
+        lc == x or lc == y for lc, x, y in zip(label, s_low[j:end], s_leet[j:end])
+    )
+
+
+def build_common_passwords(path: str, db_path: str, error_rate: float = 0.01) -> None:
+    """Build the store load_common_passwords reads from a one-per-line wordlist.
+
+    Does nothing if db_path is already newer than path. db_path is written
+    as a whole file, so it must not be a database used for anything else.
+    """
+    if os.path.exists(db_path):
+        if os.path.getmtime(db_path) >= os.path.getmtime(path):
+            return
+        if not _is_common_store(db_path):
+            raise FileExistsError(f"{db_path} exists and is not a common-password store")
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        count = sum(1 for line in f if line.strip())
+    bloom = BloomFilter(count, error_rate)
+
+    def words() -> Iterator[Tuple[str]]:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                word = line.strip()
+                if word:
+                    word = word.lower()
+                    bloom.add(word)
+                    yield (word,)
+
+    # Build beside the target and move it into place, so a failed build
+    # never leaves a half-written store at db_path
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = sqlite3.connect(tmp_path)
+    try:
+        with db:
+            db.execute("CREATE TABLE common (word TEXT PRIMARY KEY) WITHOUT ROWID")
+            db.executemany("INSERT OR IGNORE INTO common VALUES (?)", words())
+            db.execute("CREATE TABLE bloom (size INTEGER, hashes INTEGER, bits BLOB)")
+            db.execute("INSERT INTO bloom VALUES (?, ?, ?)", (bloom.size, bloom.hashes, bytes(bloom.bits)))
+    except BaseException:
+        db.close()
+        os.remove(tmp_path)
+        raise
+    db.close()
+    os.replace(tmp_path, db_path)
+
+
+def _readonly_uri(db_path: str) -> str:
+    # as_uri() percent-encodes, so paths holding ? or # stay intact
+    return pathlib.Path(db_path).absolute().as_uri() + "?mode=ro"
+
+
+def _is_common_store(db_path: str) -> bool:
+    db = sqlite3.connect(_readonly_uri(db_path), uri=True)
+    try:
+        tables = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        db.close()
+    return tables == {"common", "bloom"}
+
+
+def load_common_passwords(db_path: str) -> BloomFilter:
+    """Use a store from build_common_passwords as extra common passwords."""
+    global _EXTRA_COMMON
+    # Read-only, so loading never creates or modifies a file
+    db = sqlite3.connect(_readonly_uri(db_path), uri=True, check_same_thread=False)
+    try:
+        size, hashes, bits = db.execute("SELECT size, hashes, bits FROM bloom").fetchone()
+    except BaseException:
+        db.close()
+        raise
+    bloom = BloomFilter.from_bits(size, hashes, bits)
+    with _EXTRA_COMMON_LOCK:
+        old, _EXTRA_COMMON = _EXTRA_COMMON, (bloom, db)
+        if old is not None:
+            old[1].close()
+    return bloom
+
+
+def unload_common_passwords() -> None:
+    global _EXTRA_COMMON
+    with _EXTRA_COMMON_LOCK:
+        if _EXTRA_COMMON is not None:
+            _EXTRA_COMMON[1].close()
+        _EXTRA_COMMON = None
+
+
+def is_common_password(pw: str) -> bool:
+    pw_low = pw.lower()
+    if pw_low in COMMON_PASSWORDS:
+        return True
+    extra = _EXTRA_COMMON
+    if extra is None or pw_low not in extra[0]:
+        return False
+    # Bloom hit: may be a false positive, so check the exact list on disk.
+    # Re-read under the lock in case another thread swapped the list.
+    with _EXTRA_COMMON_LOCK:
+        if _EXTRA_COMMON is None:
+            return False
+        row = _EXTRA_COMMON[1].execute("SELECT 1 FROM common WHERE word = ?", (pw_low,)).fetchone()
+    return row is not None
+
+
+# (detector key, score penalty, penalty message, suggestion or None), in report order
+PATTERN_RULES = (
+    ("common", 50, "Common password detected", None),
+    ("seq", 15, "Sequential pattern present", "Avoid sequences like abcd or 1234"),
+    ("kbd", 10, "Keyboard sequence present", "Avoid keyboard patterns like qwerty"),
+    ("rep", 10, "Repeated characters run", "Avoid repeating the same character 3+ times"),
+    ("dict", 10, "Dictionary word detected", "Avoid common words or names, or break them up"),
+    ("date", 5, "Looks like a date", "Do not use dates or birthdays"),
+)
+
+CLASS_TIPS = (
+    ("lower", "Add lowercase letters"),
+    ("upper", "Add uppercase letters"),
+    ("digit", "Include a digit"),
+    ("symbol", "Include a symbol like !?%#"),
+)
+
+
+@dataclass
+class Result:
+    """Outcome of evaluate_password; to_dict() gives the JSON shape."""
+    __slots__ = ("password_length", "score", "label", "entropy_bits", "penalties", "suggestions")
+
+    password_length: int
+    score: int
+    label: str
+    entropy_bits: float
+    penalties: List[str]
+    suggestions: List[str]
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _score(pw: str) -> Tuple[int, str, Dict[str, bool], float, Dict[str, bool]]:
+    """Numeric core shared by evaluate_password and bulk_evaluate.
+
+    Returns (score, label, classes, entropy, found), where found holds the
+    pattern detector results. Builds no penalty or suggestion text.
+    """
     length = len(pw)
-    classes = char_classes(pw)
-    entropy = shannon_entropy(pw)
+    classes, entropy = char_stats(pw)
+
+    # Pattern detectors, evaluated once and shared by penalties and tips
+    found = {
+        "common": is_common_password(pw),
+        "seq": has_sequence(pw),
+        "kbd": has_keyboard_sequence(pw),
+        "rep": REPEAT_RE.search(pw) is not None,
+        "dict": contains_dictionary_word(pw),
+        "date": looks_like_date(pw),
+    }
 
     # Base scores
     length_score = max(0, min(40, (length - 4) * 4))  # len 14 -> 40
@@ -123,101 +451,92 @@ def evaluate_password(pw: str) -> Dict:
     score = length_score + variety_score + entropy_bonus + long_bonus
 
     # Penalties
-    penalties = []
-    if pw.lower() in COMMON_PASSWORDS:
-        score -= 50
-        penalties.append("Common password detected")
-    if has_sequence(pw):
-        score -= 15
-        penalties.append("Sequential pattern present")
-    if has_keyboard_sequence(pw):
-        score -= 10
-        penalties.append("Keyboard sequence present")
-    if REPEAT_RE.search(pw):
-        score -= 10
-        penalties.append("Repeated characters run")
-    if contains_dictionary_word(pw):
-        score -= 10
-        penalties.append("Dictionary word detected")
-    if looks_like_date(pw):
-        score -= 5
-        penalties.append("Looks like a date")
+    for key, points, _, _ in PATTERN_RULES:
+        if found[key]:
+            score -= points
 
     score = max(0, min(100, score))
 
-    # Label
-    if score < 25:
-        label = "Weak"
-    elif score < 50:
-        label = "Fair"
-    elif score < 75:
-        label = "Good"
-    else:
-        label = "Strong"
+    label = LABELS[bisect.bisect_right(LABEL_THRESHOLDS, score)]
+
+    return score, label, classes, entropy, found
+
+
+def evaluate_password(pw: str) -> Result:
+    score, label, classes, entropy, found = _score(pw)
+    length = len(pw)
 
     # Suggestions
     tips: List[str] = []
     if length < 12:
         tips.append("Use at least 12 characters; 16+ is better")
-    if not classes["lower"]:
-        tips.append("Add lowercase letters")
-    if not classes["upper"]:
-        tips.append("Add uppercase letters")
-    if not classes["digit"]:
-        tips.append("Include a digit")
-    if not classes["symbol"]:
-        tips.append("Include a symbol like !?%#")
-    if has_sequence(pw):
-        tips.append("Avoid sequences like abcd or 1234")
-    if has_keyboard_sequence(pw):
-        tips.append("Avoid keyboard patterns like qwerty")
-    if REPEAT_RE.search(pw):
-        tips.append("Avoid repeating the same character 3+ times")
-    if contains_dictionary_word(pw):
-        tips.append("Avoid common words or names, or break them up")
-    if looks_like_date(pw):
-        tips.append("Do not use dates or birthdays")
+    for cls, tip in CLASS_TIPS:
+        if not classes[cls]:
+            tips.append(tip)
+
+    # Penalties and their tips in one pass over the rules
+    penalties: List[str] = []
+    for key, _, message, tip in PATTERN_RULES:
+        if found[key]:
+            penalties.append(message)
+            if tip is not None:
+                tips.append(tip)
+
     if len(tips) == 0 and label != "Strong":
         tips.append("Add length and mix character types for a higher score")
 
-    return {
-        "password_length": length,
-        "score": score,
-        "label": label,
-        "entropy_bits": round(entropy, 2),
-        "penalties": penalties,
-        "suggestions": tips,
-    }
+    return Result(
+        password_length=length,
+        score=score,
+        label=label,
+        entropy_bits=round(entropy, 2),
+        penalties=penalties,
+        suggestions=tips,
+    )
+
+
+def bulk_evaluate(passwords: Iterable[str]) -> List[Tuple[int, str]]:
+    """Score many passwords, e.g. a wordlist audit.
+
+    Returns (score, label) per password, skipping the penalty and
+    suggestion text that evaluate_password builds for a single check.
+    """
+    return [_score(pw)[:2] for pw in passwords]
 
-def _format_human(result: Dict) -> str:
-    bullets = "\n  - ".join(result["suggestions"]) or "\n  - None"
-    pens = "\n  - ".join(result["penalties"]) or "\n  - None"
+def _format_human(result: Result, color: bool = False) -> str:
+    label = COLORED_LABELS[result.label] if color else result.label
+    bullets = "\n  - ".join(result.suggestions) or "\n  - None"
+    pens = "\n  - ".join(result.penalties) or "\n  - None"
     return (
-        f"Strength: {result['label']} ({result['score']}/100)\n"
-        f"Length: {result['password_length']}\n"
-        f"Entropy (Shannon): {result['entropy_bits']} bits\n"
+        f"Strength: {label} ({result.score}/100)\n"
+        f"Length: {result.password_length}\n"
+        f"Entropy (Shannon): {result.entropy_bits} bits\n"
         f"Penalties:{pens}\n"
         f"Suggestions:{bullets}\n"
     )
 
-def _parse_args(argv: List[str]) -> Tuple[bool, bool, str | None]:
-    show = "--show" in argv
-    json_flag = "--json" in argv
+def _parse_args(argv: List[str]) -> Tuple[bool, bool, bool, str | None]:
+    show = json_flag = color = False
     pw_arg = None
-    rest = [a for a in argv if a not in {"--show", "--json"}]
-    if len(rest) >= 2:
-        pw_arg = rest[1]
-    return show, json_flag, pw_arg
+    for a in argv[1:]:
+        if a == "--show":
+            show = True
+        elif a == "--json":
+            json_flag = True
+        elif a == "--color":
+            color = True
+        elif pw_arg is None:
+            pw_arg = a
+    return show, json_flag, color, pw_arg
 
 def main() -> int:
-    show, as_json, pw_arg = _parse_args(sys.argv)
+    show, as_json, color, pw_arg = _parse_args(sys.argv)
 
     if pw_arg is None:
         try:
             if show:
                 pw = input("Enter password (visible): ")
             else:
-                import getpass
                 pw = getpass.getpass("Enter password: ")
         except KeyboardInterrupt:
             print("\nCanceled.")
@@ -228,9 +547,9 @@ def main() -> int:
     result = evaluate_password(pw)
 
     if as_json:
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result.to_dict(), indent=2))
     else:
-        print(_format_human(result))
+        print(_format_human(result, color=color))
     return 0
 
 if __name__ == "__main__":